@@ -6,12 +6,24 @@ import argparse
 import sys
 from pathlib import Path
 from typing import Sequence
+from urllib.parse import urlparse
 
-from .api import compose_download_url, extract_list_id, fetch_list_payload, normalize_base_url
-from .constants import DEFAULT_SERIES_NAME
+from .api import extract_list_id, fetch_list_payload, normalize_base_url
+from .constants import DEFAULT_SERIES_LOGO, DEFAULT_SERIES_NAME
+from .distributed import DEFAULT_LEASE_SECONDS, BuildOptions, expand_sources, run_coordinator, run_worker
+from .entry_store import write_entry_store
 from .log_utils import log
-from .onepace import build_onepace_entries
-from .playlist import PlaylistEntry, render_m3_playlist, render_m3u8_playlist, write_playlist
+from .onepace import build_multi_locale_entries, build_onepace_entries
+from .pipeline import DEFAULT_FETCH_WORKERS, DEFAULT_QUEUE_DEPTH, run_onepace_pipeline
+from .playlist import (
+    DEFAULT_SEGMENT_SECONDS,
+    PlaylistEntry,
+    build_list_entries,
+    render_m3_playlist,
+    render_m3u8_playlist,
+    write_hls_playlists,
+    write_playlist,
+)
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -54,11 +66,29 @@ def build_parser() -> argparse.ArgumentParser:
         action="append",
         help="(One Pace only) include arcs whose title contains this substring. Repeatable.",
     )
+    parser.add_argument(
+        "--locale",
+        dest="locales",
+        action="append",
+        help=(
+            "(One Pace only) site locale code (e.g. 'fr') or watch URL to build in parallel; each gets its own "
+            "output named <output>-<locale>. Repeatable; combined with source when both are given."
+        ),
+    )
     parser.add_argument(
         "--mode",
-        choices=("m3u", "m3u8"),
+        choices=("m3u", "m3u8", "hls"),
         default="m3u",
-        help="Output playlist format (default: %(default)s).",
+        help=(
+            "Output playlist format (default: %(default)s). 'hls' writes a master index plus one "
+            "byte-range media playlist per episode."
+        ),
+    )
+    parser.add_argument(
+        "--segment-seconds",
+        type=float,
+        default=DEFAULT_SEGMENT_SECONDS,
+        help="(--mode hls only) target length of each EXT-X-BYTERANGE segment (default: %(default)s).",
     )
     parser.add_argument(
         "--series-name",
@@ -80,17 +110,88 @@ def build_parser() -> argparse.ArgumentParser:
         default=None,
         help="(One Pace only) optional prefix for tvg-id (e.g., 'onepace-').",
     )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="(One Pace, --mode m3u only) stream each arc to the output as soon as it and all earlier arcs are ready.",
+    )
+    parser.add_argument(
+        "--queue-depth",
+        type=int,
+        default=DEFAULT_QUEUE_DEPTH,
+        help="(--pipeline only) capacity of each queue between pipeline stages (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--fetch-workers",
+        type=int,
+        default=DEFAULT_FETCH_WORKERS,
+        help="(--pipeline only) concurrent Pixeldrain list fetches (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--atomic-output",
+        action="store_true",
+        help="(--pipeline only) stream into '<output>.partial' and replace the output only once the build succeeds.",
+    )
+    parser.add_argument(
+        "--entry-store",
+        dest="entry_store",
+        default=None,
+        help="Also write the entries to this memory-mappable binary store for fast reopening.",
+    )
+    parser.add_argument(
+        "--work-queue",
+        dest="work_queue",
+        default=None,
+        help="Shared directory for a sharded build; this process coordinates (queues, helps, merges).",
+    )
+    parser.add_argument(
+        "--worker",
+        action="store_true",
+        help="(With --work-queue) only claim and process shards queued by a coordinator, then exit.",
+    )
+    parser.add_argument(
+        "--add-list",
+        dest="extra_lists",
+        action="append",
+        help="(With --work-queue) extra Pixeldrain list URL/ID to shard into the build. Repeatable.",
+    )
+    parser.add_argument(
+        "--lease-seconds",
+        type=float,
+        default=DEFAULT_LEASE_SECONDS,
+        help="(With --work-queue) how long a claimed shard stays leased before others may re-claim it "
+        "(default: %(default)s).",
+    )
     return parser
 
 
 def main(argv: Sequence[str] | None = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv or sys.argv[1:])
+    if args.segment_seconds <= 0:
+        parser.error("--segment-seconds must be greater than zero.")
+    if args.locales and not args.onepace:
+        parser.error("--locale requires --onepace.")
+    if args.locales and (args.pipeline or args.work_queue):
+        parser.error("--locale cannot be combined with --pipeline or --work-queue.")
+    if args.atomic_output and not args.pipeline:
+        parser.error("--atomic-output requires --pipeline.")
     try:
         if args.output is None:
             args.output = "output/onepace.m3u" if args.onepace else "output/playlist.m3u"
 
+        if args.work_queue:
+            queue_path = Path(args.work_queue)
+            if args.worker:
+                run_worker(queue_path, lease_seconds=args.lease_seconds)
+                return 0
+            return _run_sharded_build(parser, args, queue_path)
+
         base_url = normalize_base_url(args.base_url)
+        if args.onepace and args.locales:
+            return _run_multi_locale_build(parser, args, base_url)
+        if args.pipeline:
+            return _run_pipeline_build(parser, args, base_url)
         if args.onepace:
             entries = build_onepace_entries(
                 watch_url=args.source,
@@ -101,13 +202,7 @@ def main(argv: Sequence[str] | None = None) -> int:
                 series_logo=args.series_logo,
                 tvg_prefix=args.tvg_prefix,
             )
-            playlist_title = "One Pace – English Subtitles"
-            if args.mode == "m3u8":
-                playlist_content = render_m3u8_playlist(entries, playlist_title)
-            else:
-                playlist_content = render_m3_playlist(entries, playlist_title)
-            destination = Path(args.output)
-            write_playlist(playlist_content, destination, args.overwrite)
+            _emit_playlist(args, entries, "One Pace – English Subtitles")
             log(f"Playlist created with {len(entries)} entries.")
             return 0
 
@@ -119,26 +214,137 @@ def main(argv: Sequence[str] | None = None) -> int:
         if not files:
             raise RuntimeError(f"No files were found in Pixeldrain list '{list_id}'.")
         playlist_title = payload.get("title")
-        entries = [
-            PlaylistEntry(
-                title=file_info.get("name") or file_info["id"],
-                url=compose_download_url(file_info["id"], base_url),
-                duration=file_info.get("duration", -1),
-            )
-            for file_info in files
-        ]
+        entries = build_list_entries(files, base_url)
+        _emit_playlist(args, entries, playlist_title)
+        log(f"Playlist created with {len(entries)} entries.")
+        return 0
+    except Exception as exc:  # pylint: disable=broad-except
+        log(f"Error: {exc}")
+        return 1
+
 
+def _emit_playlist(
+    args: argparse.Namespace,
+    entries: Sequence[PlaylistEntry],
+    playlist_title: str | None,
+    destination: Path | None = None,
+    label: str | None = None,
+) -> None:
+    destination = destination or Path(args.output)
+    store_path: Path | None = None
+    if args.entry_store:
+        store_path = Path(args.entry_store)
+        store_path = _with_label(store_path, label) if label else store_path
+    if not args.overwrite:
+        for path in (destination, store_path):
+            if path is not None and path.exists():
+                raise FileExistsError(f"{path} already exists. Use --overwrite to replace it.")
+
+    if args.mode == "hls":
+        write_hls_playlists(entries, destination, args.overwrite, playlist_title, args.segment_seconds)
+    else:
         if args.mode == "m3u8":
             playlist_content = render_m3u8_playlist(entries, playlist_title)
         else:
             playlist_content = render_m3_playlist(entries, playlist_title)
-        destination = Path(args.output)
         write_playlist(playlist_content, destination, args.overwrite)
-        log(f"Playlist created with {len(entries)} entries.")
-        return 0
-    except Exception as exc:  # pylint: disable=broad-except
-        log(f"Error: {exc}")
-        return 1
+    if store_path is not None:
+        write_entry_store(entries, store_path, args.overwrite)
+
+
+def _run_pipeline_build(parser: argparse.ArgumentParser, args: argparse.Namespace, base_url: str) -> int:
+    if not args.onepace or args.mode != "m3u" or args.entry_store:
+        parser.error("--pipeline requires --onepace with --mode m3u and no --entry-store.")
+    result = run_onepace_pipeline(
+        watch_url=args.source,
+        base_url=base_url,
+        destination=Path(args.output),
+        overwrite=args.overwrite,
+        title="One Pace – English Subtitles",
+        arc_filters=args.arc_filters,
+        series_name=args.series_name,
+        series_group=args.series_group,
+        series_logo=args.series_logo,
+        tvg_prefix=args.tvg_prefix,
+        queue_depth=args.queue_depth,
+        fetch_workers=args.fetch_workers,
+        atomic=args.atomic_output,
+    )
+    if result.first_block_seconds is not None:
+        log(f"First arc written after {result.first_block_seconds:.2f}s (total {result.total_seconds:.2f}s).")
+    for stats in result.queue_stats:
+        log(
+            f"Queue {stats.name}: mean occupancy {stats.mean_occupancy:.2f}/{stats.capacity}, "
+            f"max {stats.max_occupancy}, {stats.puts} item(s)"
+        )
+    log(f"Reorder buffer: max {result.max_reordered}/{result.reorder_capacity} block(s) held")
+    log(f"Playlist created with {result.entry_count} entries.")
+    return 0
+
+
+def _run_multi_locale_build(parser: argparse.ArgumentParser, args: argparse.Namespace, base_url: str) -> int:
+    targets = ([args.source] if args.source else []) + list(args.locales)
+    labels = {target: _locale_label(target) for target in targets}
+    duplicates = sorted({label for label in labels.values() if list(labels.values()).count(label) > 1})
+    if duplicates:
+        parser.error(f"--locale targets map to the same output more than once: {', '.join(duplicates)}")
+    results, errors = build_multi_locale_entries(
+        watch_targets=targets,
+        base_url=base_url,
+        arc_filters=args.arc_filters,
+        series_name=args.series_name,
+        series_group=args.series_group,
+        series_logo=args.series_logo,
+        tvg_prefix=args.tvg_prefix,
+    )
+    output = Path(args.output)
+    for target, entries in results.items():
+        label = labels[target]
+        _emit_playlist(args, entries, "One Pace – English Subtitles", _with_label(output, label), label)
+        log(f"Playlist for '{target}' created with {len(entries)} entries.")
+    for target, exc in errors.items():
+        log(f"Error: locale '{target}' failed: {exc}")
+    return 1 if errors else 0
+
+
+def _with_label(path: Path, label: str) -> Path:
+    return path.with_name(f"{path.stem}-{label}{path.suffix}")
+
+
+def _locale_label(target: str) -> str:
+    parsed = urlparse(target)
+    if not parsed.scheme:
+        return target.strip().strip("/")
+    segments = [segment for segment in parsed.path.split("/") if segment and segment != "watch"]
+    return segments[0] if segments else parsed.netloc
+
+
+def _run_sharded_build(parser: argparse.ArgumentParser, args: argparse.Namespace, queue_path: Path) -> int:
+    base_url = normalize_base_url(args.base_url)
+    list_sources = list(args.extra_lists or [])
+    if not args.onepace:
+        if not args.source and not list_sources:
+            parser.error("source or --add-list is required unless --onepace is supplied.")
+        if args.source:
+            list_sources.insert(0, args.source)
+    shards = expand_sources(
+        list_sources=list_sources,
+        watch_url=args.source if args.onepace else None,
+        onepace=args.onepace,
+        arc_filters=args.arc_filters,
+        series_group=args.series_group,
+    )
+    options = BuildOptions(
+        base_url=base_url,
+        series_prefix=(args.series_name or "").strip(),
+        tvg_logo=DEFAULT_SERIES_LOGO if args.series_logo is None else args.series_logo,
+        tvg_prefix=args.tvg_prefix,
+    )
+    list_title, entries = run_coordinator(queue_path, shards, options, lease_seconds=args.lease_seconds)
+    playlist_title = "One Pace – English Subtitles" if args.onepace else list_title
+    _emit_playlist(args, entries, playlist_title)
+    log(f"Playlist created with {len(entries)} entries from {len(shards)} shard(s).")
+    return 0
 
 
 if __name__ == "__main__":
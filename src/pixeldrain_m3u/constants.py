@@ -1,7 +1,8 @@
 """Shared constants for the Pixeldrain playlist builder."""
 
 DEFAULT_BASE_URL = "https://pixeldrain.net"
-DEFAULT_ONEPACE_WATCH_URL = "https://onepace.net/en/watch"
+ONEPACE_WATCH_URL_TEMPLATE = "https://onepace.net/{locale}/watch"
+DEFAULT_ONEPACE_WATCH_URL = ONEPACE_WATCH_URL_TEMPLATE.format(locale="en")
 DEFAULT_SERIES_NAME = ""
 DEFAULT_SERIES_GROUP = "(S|JP) One Pace"
 DEFAULT_SERIES_LOGO = "https://logos-world.net/wp-content/uploads/2021/09/One-Piece-Logo.png"
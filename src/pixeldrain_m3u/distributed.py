@@ -0,0 +1,405 @@
+"""Sharded coordinator/worker builds coordinated through a shared work-queue directory.
+
+The queue needs nothing but a directory that every worker can reach (local disk, NFS or SMB); it avoids
+SQLite because SQLite's locking is unreliable on network filesystems. Layout::
+
+    <queue>/CURRENT                          ID of the build workers should serve (replaced atomically)
+    <queue>/builds/<build_id>/build.json     build options and the ordered shard specs
+    <queue>/builds/<build_id>/leases/<i>.<n>.json      lease for attempt ``n`` of shard ``i``
+    <queue>/builds/<build_id>/leases/<i>.<n>.released  attempt ``n`` gave up early (error)
+    <queue>/builds/<build_id>/results/<i>.json         partial result of shard ``i``
+    <queue>/builds/<build_id>/failed/<i>.json          shard ``i`` used all attempts
+
+Claiming attempt ``n`` means creating its lease file exclusively (a hard link, falling back to
+``O_EXCL``), so exactly one worker wins each attempt even across machines. An attempt whose lease has
+expired or been released is superseded by creating attempt ``n + 1``. Every other file is written to a
+temporary name and renamed into place. Lease expiry compares wall clocks, so hosts need roughly
+synchronised clocks (well within ``lease_seconds``).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import socket
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Sequence
+
+from .api import extract_list_id, fetch_list_payload
+from .constants import DEFAULT_ONEPACE_WATCH_URL, DEFAULT_SERIES_LOGO
+from .log_utils import log
+from .onepace import build_arc_entries, fetch_watch_page, parse_watch_page, select_arc_lists, watch_page_locale
+from .playlist import PlaylistEntry, build_list_entries
+
+DEFAULT_LEASE_SECONDS = 300
+DEFAULT_POLL_INTERVAL = 2.0
+DEFAULT_MAX_ATTEMPTS = 3
+
+
+@dataclass(frozen=True)
+class ShardSpec:
+    """One unit of work: a single Pixeldrain list, optionally tagged with its One Pace arc."""
+
+    list_id: str
+    arc_title: str | None = None
+    group_title: str | None = None
+
+
+@dataclass(frozen=True)
+class ShardClaim:
+    """A leased attempt at a shard, together with the build generation it belongs to."""
+
+    build_id: str
+    shard_index: int
+    attempt: int
+    shard: ShardSpec
+
+
+@dataclass(frozen=True)
+class BuildOptions:
+    """Settings every worker needs to turn a fetched list into playlist entries."""
+
+    base_url: str
+    series_prefix: str = ""
+    tvg_logo: str | None = DEFAULT_SERIES_LOGO
+    tvg_prefix: str | None = None
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+
+
+def expand_sources(
+    *,
+    list_sources: Sequence[str] | None = None,
+    watch_url: str | None = None,
+    onepace: bool = False,
+    arc_filters: Sequence[str] | None = None,
+    series_group: str | None = None,
+) -> list[ShardSpec]:
+    """Expand plain list IDs/URLs and (optionally) One Pace arcs into ordered shards."""
+    shards: list[ShardSpec] = []
+    if onepace:
+        resolved_watch_url = (watch_url or DEFAULT_ONEPACE_WATCH_URL).strip() or DEFAULT_ONEPACE_WATCH_URL
+        arcs = parse_watch_page(fetch_watch_page(resolved_watch_url), watch_page_locale(resolved_watch_url))
+        for arc, list_id in select_arc_lists(arcs, arc_filters):
+            group_value = (series_group or arc.title).strip() or arc.title
+            shards.append(ShardSpec(list_id=list_id, arc_title=arc.title, group_title=group_value))
+    for source in list_sources or ():
+        shards.append(ShardSpec(list_id=extract_list_id(source)))
+    if not shards:
+        raise RuntimeError("No shards were produced from the supplied sources.")
+    return shards
+
+
+def enqueue_build(queue_path: Path, shards: Sequence[ShardSpec], options: BuildOptions) -> str:
+    """Publish a fresh build as the queue's current one, discarding older builds; return its build ID."""
+    build_id = uuid.uuid4().hex
+    build_dir = _build_dir(queue_path, build_id)
+    for name in ("leases", "results", "failed"):
+        (build_dir / name).mkdir(parents=True, exist_ok=True)
+    _write_json_atomic(
+        build_dir / "build.json",
+        {"options": asdict(options), "shards": [asdict(shard) for shard in shards]},
+    )
+    _write_json_atomic(queue_path / "CURRENT", {"build_id": build_id})
+    for stale in (queue_path / "builds").iterdir():
+        if stale.name != build_id:
+            shutil.rmtree(stale, ignore_errors=True)
+    log(f"Queued {len(shards)} shard(s) for build {build_id} in {queue_path}")
+    return build_id
+
+
+def current_build_id(queue_path: Path) -> str:
+    """ID of the build that workers on this queue are currently serving."""
+    try:
+        return _read_json(queue_path / "CURRENT")["build_id"]
+    except FileNotFoundError as exc:
+        raise RuntimeError("Work queue has no build queued; start a coordinator first.") from exc
+
+
+def claim_shard(
+    queue_path: Path,
+    build_id: str,
+    worker_id: str,
+    lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    now: float | None = None,
+) -> ShardClaim | None:
+    """Lease the next unfinished shard of ``build_id``, superseding attempts whose lease expired.
+
+    An expired or released lease counts as a used attempt: once a shard has used ``max_attempts`` it is
+    marked failed instead of being handed out again, so a shard that keeps killing its worker cannot loop.
+    """
+    current = time.time() if now is None else now
+    build_dir = _build_dir(queue_path, build_id)
+    try:
+        build = _read_json(build_dir / "build.json")
+        lease_names = os.listdir(build_dir / "leases")
+    except FileNotFoundError:
+        return None
+    max_attempts = build["options"]["max_attempts"]
+    latest_attempts = _latest_attempts(lease_names)
+
+    for index, spec in enumerate(build["shards"]):
+        if _shard_finished(build_dir, index):
+            continue
+        latest = latest_attempts.get(index, 0)
+        if latest:
+            lease = _read_lease(build_dir, index, latest)
+            if lease is None or (lease["expires"] >= current and not _lease_released(build_dir, index, latest)):
+                continue
+            if latest >= max_attempts:
+                _write_json_atomic(
+                    build_dir / "failed" / f"{index}.json",
+                    {"error": lease.get("error") or "lease expired on every attempt"},
+                )
+                continue
+        attempt = latest + 1
+        lease_path = build_dir / "leases" / f"{index}.{attempt}.json"
+        if _create_exclusive(lease_path, {"owner": worker_id, "expires": current + lease_seconds}):
+            return ShardClaim(build_id=build_id, shard_index=index, attempt=attempt, shard=ShardSpec(**spec))
+    return None
+
+
+def complete_shard(queue_path: Path, claim: ShardClaim, worker_id: str, result: dict[str, Any]) -> bool:
+    """Store a shard's partial result; return False if the lease or its build was superseded."""
+    build_dir = _build_dir(queue_path, claim.build_id)
+    if not _still_holds(build_dir, claim, worker_id):
+        return False
+    try:
+        _write_json_atomic(build_dir / "results" / f"{claim.shard_index}.json", result)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def fail_shard(queue_path: Path, claim: ShardClaim, worker_id: str, error: str, max_attempts: int) -> bool:
+    """Release a shard after an error, giving up once it has used all attempts; return False if not ours."""
+    build_dir = _build_dir(queue_path, claim.build_id)
+    if not _still_holds(build_dir, claim, worker_id):
+        return False
+    try:
+        if claim.attempt >= max_attempts:
+            _write_json_atomic(build_dir / "failed" / f"{claim.shard_index}.json", {"error": error})
+        else:
+            _write_json_atomic(build_dir / "leases" / f"{claim.shard_index}.{claim.attempt}.released", {"error": error})
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def process_shard(shard: ShardSpec, options: BuildOptions) -> dict[str, Any]:
+    """Fetch one shard's Pixeldrain list and build its playlist entries."""
+    payload = fetch_list_payload(shard.list_id, options.base_url)
+    files = payload.get("files") or []
+    if not files:
+        log(f"Skipping shard '{shard.arc_title or shard.list_id}' (Pixeldrain list '{shard.list_id}' empty)")
+        entries: list[PlaylistEntry] = []
+    elif shard.arc_title is not None:
+        entries = build_arc_entries(
+            arc_title=shard.arc_title,
+            group_title=shard.group_title or shard.arc_title,
+            files=files,
+            base_url=options.base_url,
+            tvg_logo=options.tvg_logo,
+            tvg_prefix=options.tvg_prefix,
+            series_prefix=options.series_prefix,
+        )
+    else:
+        entries = build_list_entries(files, options.base_url)
+    return {"title": payload.get("title"), "entries": [_entry_to_json(entry) for entry in entries]}
+
+
+def run_worker(
+    queue_path: Path,
+    *,
+    build_id: str | None = None,
+    worker_id: str | None = None,
+    lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+) -> int:
+    """Claim and process shards until the build is finished; return the number processed.
+
+    Without ``build_id`` the worker follows whichever build is current, switching when a coordinator
+    re-queues. With ``build_id`` it serves only that build and raises if another build replaces it.
+    """
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    processed = 0
+    while True:
+        serving = current_build_id(queue_path)
+        if build_id is not None and serving != build_id:
+            raise RuntimeError(f"Build {build_id} was replaced by build {serving} in {queue_path}")
+        options = _load_options(queue_path, serving)
+        claim = claim_shard(queue_path, serving, worker_id, lease_seconds)
+        if claim is None:
+            if _build_settled(queue_path, serving):
+                break
+            time.sleep(poll_interval)
+            continue
+        try:
+            result = process_shard(claim.shard, options)
+        except Exception as exc:  # pylint: disable=broad-except
+            log(f"Worker {worker_id} failed shard {claim.shard_index}: {exc}")
+            fail_shard(queue_path, claim, worker_id, str(exc), options.max_attempts)
+            continue
+        if not complete_shard(queue_path, claim, worker_id, result):
+            log(f"Worker {worker_id} discarded shard {claim.shard_index}; its lease or build was superseded")
+            continue
+        processed += 1
+    log(f"Worker {worker_id} processed {processed} shard(s).")
+    return processed
+
+
+def merge_results(queue_path: Path, build_id: str | None = None) -> tuple[str | None, list[PlaylistEntry]]:
+    """Combine the finished shards of a build, in queue order, into one entry list and the first list title.
+
+    ``build_id`` defaults to the current build; when given it must still be current, so a coordinator never
+    merges a build that another coordinator queued over it.
+    """
+    serving = current_build_id(queue_path)
+    if build_id is not None and serving != build_id:
+        raise RuntimeError(f"Build {build_id} was replaced by build {serving} in {queue_path}")
+    build_dir = _build_dir(queue_path, serving)
+    shard_count = len(_read_json(build_dir / "build.json")["shards"])
+
+    failed = [index for index in range(shard_count) if (build_dir / "failed" / f"{index}.json").exists()]
+    if failed:
+        details = "; ".join(
+            f"shard {index}: {_read_json(build_dir / 'failed' / f'{index}.json')['error']}" for index in failed
+        )
+        raise RuntimeError(f"{len(failed)} shard(s) failed: {details}")
+    unfinished = [index for index in range(shard_count) if not (build_dir / "results" / f"{index}.json").exists()]
+    if unfinished:
+        raise RuntimeError(f"Build is not finished; shards still outstanding: {unfinished}")
+
+    title: str | None = None
+    entries: list[PlaylistEntry] = []
+    for index in range(shard_count):
+        result = _read_json(build_dir / "results" / f"{index}.json")
+        title = title or result.get("title")
+        entries.extend(_entry_from_json(item) for item in result["entries"])
+    if not entries:
+        raise RuntimeError("No playable entries were produced by the sharded build.")
+    return title, entries
+
+
+def run_coordinator(
+    queue_path: Path,
+    shards: Sequence[ShardSpec],
+    options: BuildOptions,
+    *,
+    lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+) -> tuple[str | None, list[PlaylistEntry]]:
+    """Queue the shards, help process them, wait for other workers, then merge this build in order."""
+    build_id = enqueue_build(queue_path, shards, options)
+    run_worker(queue_path, build_id=build_id, lease_seconds=lease_seconds, poll_interval=poll_interval)
+    return merge_results(queue_path, build_id)
+
+
+def _build_dir(queue_path: Path, build_id: str) -> Path:
+    return queue_path / "builds" / build_id
+
+
+def _load_options(queue_path: Path, build_id: str) -> BuildOptions:
+    return BuildOptions(**_read_json(_build_dir(queue_path, build_id) / "build.json")["options"])
+
+
+def _build_settled(queue_path: Path, build_id: str) -> bool:
+    build_dir = _build_dir(queue_path, build_id)
+    try:
+        shard_count = len(_read_json(build_dir / "build.json")["shards"])
+    except FileNotFoundError:
+        return True
+    return all(_shard_finished(build_dir, index) for index in range(shard_count))
+
+
+def _shard_finished(build_dir: Path, index: int) -> bool:
+    return (build_dir / "results" / f"{index}.json").exists() or (build_dir / "failed" / f"{index}.json").exists()
+
+
+def _latest_attempts(lease_names: Sequence[str]) -> dict[int, int]:
+    latest: dict[int, int] = {}
+    for name in lease_names:
+        parts = name.split(".")
+        if len(parts) != 3 or parts[2] != "json" or not (parts[0].isdigit() and parts[1].isdigit()):
+            continue
+        index, attempt = int(parts[0]), int(parts[1])
+        latest[index] = max(latest.get(index, 0), attempt)
+    return latest
+
+
+def _read_lease(build_dir: Path, index: int, attempt: int) -> dict[str, Any] | None:
+    """Lease contents merged with any release marker; None while an ``O_EXCL`` lease is still being written."""
+    try:
+        lease = _read_json(build_dir / "leases" / f"{index}.{attempt}.json")
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    released = build_dir / "leases" / f"{index}.{attempt}.released"
+    if released.exists():
+        lease = {**lease, "error": _read_json(released).get("error")}
+    return lease
+
+
+def _lease_released(build_dir: Path, index: int, attempt: int) -> bool:
+    return (build_dir / "leases" / f"{index}.{attempt}.released").exists()
+
+
+def _still_holds(build_dir: Path, claim: ShardClaim, worker_id: str) -> bool:
+    lease = _read_lease(build_dir, claim.shard_index, claim.attempt)
+    if lease is None or lease.get("owner") != worker_id:
+        return False
+    return not (build_dir / "leases" / f"{claim.shard_index}.{claim.attempt + 1}.json").exists()
+
+
+def _read_json(path: Path) -> Any:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _temp_sibling(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+
+
+def _write_json_atomic(path: Path, data: Any) -> None:
+    temp_path = _temp_sibling(path)
+    with temp_path.open("x", encoding="utf-8") as handle:
+        json.dump(data, handle)
+    try:
+        os.replace(temp_path, path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+def _create_exclusive(path: Path, data: Any) -> bool:
+    """Create ``path`` only if it does not exist yet; exactly one concurrent caller gets True."""
+    temp_path = _temp_sibling(path)
+    with temp_path.open("x", encoding="utf-8") as handle:
+        json.dump(data, handle)
+    try:
+        os.link(temp_path, path)
+        return True
+    except FileExistsError:
+        return False
+    except OSError:
+        # Filesystem without hard links: fall back to an exclusive create of the lease itself.
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(data, handle)
+        return True
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+def _entry_to_json(entry: PlaylistEntry) -> dict[str, Any]:
+    data = asdict(entry)
+    data["attrs"] = dict(entry.attrs) if entry.attrs is not None else None
+    return data
+
+
+def _entry_from_json(data: dict[str, Any]) -> PlaylistEntry:
+    return PlaylistEntry(**data)
@@ -0,0 +1,272 @@
+"""Compact binary entry store opened with ``mmap`` for random access to huge playlists.
+
+Layout (little-endian), in file order:
+
+* header: magic, section counts and the byte offset of every section
+* records: one fixed-width row per entry (title, url, attribute set, group and file name as table
+  indices, then duration in seconds as a double and size)
+* string table: ``string_count + 1`` uint64 offsets followed by the UTF-8 blob; every title, URL,
+  attribute key/value and group name is stored once
+* attribute sets: ``(start, length)`` rows into a pool of ``(key, value)`` string index pairs; identical
+  attribute mappings share one set
+* groups: ``(name, start, length)`` rows into a pool of entry indices, in playlist order
+
+Stores are replaced atomically. On POSIX, readers that already have the old file mapped keep reading it
+undisturbed; on Windows a mapped file cannot be replaced, so readers must close the store before a rebuild.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import tempfile
+from pathlib import Path
+from types import MappingProxyType
+from typing import Iterator, Mapping, Sequence
+
+from .log_utils import log
+from .playlist import PlaylistEntry, render_m3_playlist
+
+MAGIC = b"PDM3US02"
+NO_INDEX = 0xFFFFFFFF
+
+_HEADER = struct.Struct("<8sIIIIQQQQQ")
+_RECORD = struct.Struct("<IIIIIdq")
+_STRING_OFFSET = struct.Struct("<Q")
+_ATTR_SET = struct.Struct("<II")
+_PAIR = struct.Struct("<II")
+_GROUP = struct.Struct("<III")
+_MEMBER = struct.Struct("<I")
+
+
+def write_entry_store(entries: Sequence[PlaylistEntry], destination: Path, overwrite: bool) -> Path:
+    """Serialize entries into the binary store format and return the path."""
+    if not entries:
+        raise ValueError("Cannot write an entry store with zero entries")
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    if destination.exists() and not overwrite:
+        raise FileExistsError(f"{destination} already exists. Use --overwrite to replace it.")
+
+    strings: dict[str, int] = {}
+    attr_sets: dict[tuple[tuple[int, int], ...], int] = {}
+    groups: dict[int, list[int]] = {}
+
+    def intern(value: str) -> int:
+        return strings.setdefault(value, len(strings))
+
+    records = bytearray()
+    for index, entry in enumerate(entries):
+        attr_index = NO_INDEX
+        group_index = NO_INDEX
+        if entry.attrs is not None:
+            pairs = tuple((intern(key), intern(str(value))) for key, value in entry.attrs.items() if value is not None)
+            attr_index = attr_sets.setdefault(pairs, len(attr_sets))
+            group = entry.attrs.get("group-title")
+            if group:
+                group_index = intern(group)
+                groups.setdefault(group_index, []).append(index)
+        records += _RECORD.pack(
+            intern(entry.title),
+            intern(entry.url),
+            attr_index,
+            group_index,
+            NO_INDEX if entry.file_name is None else intern(entry.file_name),
+            float(entry.duration),
+            int(entry.size),
+        )
+
+    encoded = [value.encode("utf-8") for value in strings]
+    string_offsets = bytearray()
+    position = 0
+    for blob in encoded:
+        string_offsets += _STRING_OFFSET.pack(position)
+        position += len(blob)
+    string_offsets += _STRING_OFFSET.pack(position)
+    string_data = b"".join(encoded)
+
+    attr_rows = bytearray()
+    pair_pool = bytearray()
+    pair_count = 0
+    for pairs in attr_sets:
+        attr_rows += _ATTR_SET.pack(pair_count, len(pairs))
+        for key_index, value_index in pairs:
+            pair_pool += _PAIR.pack(key_index, value_index)
+        pair_count += len(pairs)
+
+    group_rows = bytearray()
+    member_pool = bytearray()
+    member_count = 0
+    for name_index, members in groups.items():
+        group_rows += _GROUP.pack(name_index, member_count, len(members))
+        for member in members:
+            member_pool += _MEMBER.pack(member)
+        member_count += len(members)
+
+    records_offset = _HEADER.size
+    string_offsets_offset = records_offset + len(records)
+    string_data_offset = string_offsets_offset + len(string_offsets)
+    attr_sets_offset = string_data_offset + len(string_data)
+    groups_offset = attr_sets_offset + len(attr_rows) + len(pair_pool)
+    header = _HEADER.pack(
+        MAGIC,
+        len(entries),
+        len(strings),
+        len(attr_sets),
+        len(groups),
+        records_offset,
+        string_offsets_offset,
+        string_data_offset,
+        attr_sets_offset,
+        groups_offset,
+    )
+
+    with tempfile.NamedTemporaryFile(dir=destination.parent, prefix=f".{destination.name}.", delete=False) as handle:
+        temp_path = Path(handle.name)
+        for section in (header, records, string_offsets, string_data, attr_rows, pair_pool, group_rows, member_pool):
+            handle.write(section)
+    try:
+        # NamedTemporaryFile creates the file as 0600; give the store the mode a plain open() would.
+        os.chmod(temp_path, 0o666 & ~_current_umask())
+        os.replace(temp_path, destination)
+    except PermissionError as exc:
+        temp_path.unlink(missing_ok=True)
+        raise PermissionError(
+            f"Cannot replace {destination}; close any process that has it open (required on Windows)."
+        ) from exc
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    log(f"Entry store written to {destination.resolve()} ({len(entries)} entries, {len(strings)} strings)")
+    return destination
+
+
+class EntryStore:
+    """Read-only, memory-mapped view over a file produced by :func:`write_entry_store`."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with path.open("rb") as handle:
+            if os.fstat(handle.fileno()).st_size < _HEADER.size:
+                raise ValueError(f"{path} is too short to be a Pixeldrain entry store")
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (
+                magic,
+                self._entry_count,
+                self._string_count,
+                self._attr_set_count,
+                self._group_count,
+                self._records_offset,
+                self._string_offsets_offset,
+                self._string_data_offset,
+                self._attr_sets_offset,
+                self._groups_offset,
+            ) = _HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a Pixeldrain entry store")
+        except BaseException:
+            self._map.close()
+            raise
+        self._pairs_offset = self._attr_sets_offset + self._attr_set_count * _ATTR_SET.size
+        self._members_offset = self._groups_offset + self._group_count * _GROUP.size
+        self._attr_cache: dict[int, Mapping[str, str]] = {}
+        self._group_table: dict[str, tuple[int, int]] | None = None
+
+    def __enter__(self) -> EntryStore:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __len__(self) -> int:
+        return self._entry_count
+
+    def __getitem__(self, index: int | slice) -> PlaylistEntry | list[PlaylistEntry]:
+        if isinstance(index, slice):
+            return [self._entry(position) for position in range(*index.indices(self._entry_count))]
+        if index < 0:
+            index += self._entry_count
+        if not 0 <= index < self._entry_count:
+            raise IndexError("entry index out of range")
+        return self._entry(index)
+
+    def __iter__(self) -> Iterator[PlaylistEntry]:
+        for index in range(self._entry_count):
+            yield self._entry(index)
+
+    def groups(self) -> list[str]:
+        """Group titles in the order they first appear in the playlist."""
+        return list(self._groups())
+
+    def group_indices(self, group: str) -> list[int]:
+        """Entry indices belonging to ``group``, in playlist order."""
+        start, length = self._groups()[group]
+        offset = self._members_offset + start * _MEMBER.size
+        return list(struct.unpack_from(f"<{length}I", self._map, offset))
+
+    def group_entries(self, group: str, start: int = 0, stop: int | None = None) -> list[PlaylistEntry]:
+        """Entries of one group, optionally limited to the ``[start:stop]`` slice within that group."""
+        return [self._entry(index) for index in self.group_indices(group)[start:stop]]
+
+    def render_m3u(
+        self,
+        start: int = 0,
+        stop: int | None = None,
+        *,
+        group: str | None = None,
+        title: str | None = None,
+    ) -> str:
+        """Render a range of entries (optionally within one group) as an extended M3U playlist."""
+        if group is not None:
+            entries = self.group_entries(group, start, stop)
+        else:
+            entries = self[start:stop]
+        return render_m3_playlist(entries, title)
+
+    def _entry(self, index: int) -> PlaylistEntry:
+        title_index, url_index, attr_index, _group_index, file_name_index, duration, size = _RECORD.unpack_from(
+            self._map, self._records_offset + index * _RECORD.size
+        )
+        return PlaylistEntry(
+            title=self._string(title_index),
+            url=self._string(url_index),
+            duration=int(duration) if duration.is_integer() else duration,
+            attrs=None if attr_index == NO_INDEX else self._attrs(attr_index),
+            size=size,
+            file_name=None if file_name_index == NO_INDEX else self._string(file_name_index),
+        )
+
+    def _string(self, index: int) -> str:
+        start, end = struct.unpack_from("<QQ", self._map, self._string_offsets_offset + index * _STRING_OFFSET.size)
+        base = self._string_data_offset
+        return self._map[base + start : base + end].decode("utf-8")
+
+    def _attrs(self, index: int) -> Mapping[str, str]:
+        cached = self._attr_cache.get(index)
+        if cached is None:
+            start, length = _ATTR_SET.unpack_from(self._map, self._attr_sets_offset + index * _ATTR_SET.size)
+            attrs: dict[str, str] = {}
+            for pair in range(start, start + length):
+                key_index, value_index = _PAIR.unpack_from(self._map, self._pairs_offset + pair * _PAIR.size)
+                attrs[self._string(key_index)] = self._string(value_index)
+            cached = self._attr_cache[index] = MappingProxyType(attrs)
+        return cached
+
+    def _groups(self) -> dict[str, tuple[int, int]]:
+        if self._group_table is None:
+            table: dict[str, tuple[int, int]] = {}
+            for row in range(self._group_count):
+                name_index, start, length = _GROUP.unpack_from(self._map, self._groups_offset + row * _GROUP.size)
+                table[self._string(name_index)] = (start, length)
+            self._group_table = table
+        return self._group_table
+
+
+def _current_umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
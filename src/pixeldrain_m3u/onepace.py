@@ -2,21 +2,36 @@
 
 from __future__ import annotations
 
+import multiprocessing
 import re
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Sequence
+from typing import Any, Mapping, Sequence
+from urllib.parse import urlparse
 
 import requests
 from bs4 import BeautifulSoup
 
 from .api import compose_download_url, extract_list_id, fetch_list_payload
-from .constants import DEFAULT_ONEPACE_WATCH_URL, DEFAULT_SERIES_LOGO
+from .constants import DEFAULT_ONEPACE_WATCH_URL, DEFAULT_SERIES_LOGO, ONEPACE_WATCH_URL_TEMPLATE
 from .log_utils import log
 from .playlist import PlaylistEntry
 
 
 QUALITY_PATTERN = re.compile(r"(\d{3,4})p")
 
+# "English Subtitles" as labelled on each One Pace site locale, keyed by the locale code in the watch URL.
+# Best-effort: these follow the site's translations and may drift; matched case-insensitively.
+ENGLISH_SUBTITLE_LABELS = {
+    "en": "English Subtitles",
+    "fr": "Sous-titres anglais",
+    "de": "Englische Untertitel",
+    "es": "Subtítulos en inglés",
+    "pt": "Legendas em inglês",
+    "it": "Sottotitoli in inglese",
+    "nl": "Engelse ondertitels",
+}
+
 
 @dataclass(frozen=True)
 class OnePaceLink:
@@ -42,8 +57,15 @@ def fetch_watch_page(url: str = DEFAULT_ONEPACE_WATCH_URL) -> str:
     return response.text
 
 
-def parse_watch_page(html: str) -> list[OnePaceArc]:
-    """Parse One Pace HTML into structured arc data."""
+def parse_watch_page(html: str, locale: str | None = None) -> list[OnePaceArc]:
+    """Parse One Pace HTML into structured arc data.
+
+    The English-subtitle links are found by ``locale``'s label; pages of an unknown locale fall back to
+    accepting any known label.
+    """
+    label = ENGLISH_SUBTITLE_LABELS.get((locale or "").casefold())
+    label_keys = (label,) if label else tuple(ENGLISH_SUBTITLE_LABELS.values())
+    label_keys = tuple(key.casefold() for key in label_keys)
     soup = BeautifulSoup(html, "html.parser")
     arcs: list[OnePaceArc] = []
     for arc_li in soup.select("main ol > li"):
@@ -56,12 +78,12 @@ def parse_watch_page(html: str) -> list[OnePaceArc]:
         if description_candidate and description_candidate.parent is heading.parent:
             description = description_candidate.get_text(" ", strip=True)
 
-        english_links = _extract_english_subtitles(arc_li)
+        english_links = _extract_english_subtitles(arc_li, label_keys)
         arcs.append(OnePaceArc(title=title, description=description, english_subtitles=english_links))
     return arcs
 
 
-def _extract_english_subtitles(arc_li) -> list[OnePaceLink]:
+def _extract_english_subtitles(arc_li, label_keys: Sequence[str]) -> list[OnePaceLink]:
     languages_container = arc_li.find("ul", class_=lambda c: c and "space-y-6" in c)
     if not languages_container:
         return []
@@ -70,8 +92,8 @@ def _extract_english_subtitles(arc_li) -> list[OnePaceLink]:
         label_block = language_li.find("span")
         if not label_block:
             continue
-        label_text = label_block.get_text(" ", strip=True)
-        if "English Subtitles" not in label_text:
+        label_text = label_block.get_text(" ", strip=True).casefold()
+        if not any(key in label_text for key in label_keys):
             continue
         link_ul = language_li.find("ul", class_=lambda c: c and "flex" in c)
         if not link_ul:
@@ -137,11 +159,122 @@ def build_onepace_entries(
     """Fetch arcs from One Pace into one playlist; each episode uses the arc title as IPTV group-title (series)."""
     resolved_watch_url = (watch_url or DEFAULT_ONEPACE_WATCH_URL).strip() or DEFAULT_ONEPACE_WATCH_URL
     html = fetch_watch_page(resolved_watch_url)
-    arcs = parse_watch_page(html)
-    entries: list[PlaylistEntry] = []
-    series_prefix = (series_name or "").strip()
-    logo_value = DEFAULT_SERIES_LOGO if series_logo is None else series_logo
+    selected = select_arc_lists(parse_watch_page(html, watch_page_locale(resolved_watch_url)), arc_filters)
+    payloads: dict[str, dict[str, Any]] = {}
+    for _arc, list_id in selected:
+        if list_id not in payloads:
+            payloads[list_id] = fetch_list_payload(list_id, base_url)
+    return _assemble_onepace_entries(
+        selected,
+        payloads,
+        base_url=base_url,
+        series_name=series_name,
+        series_group=series_group,
+        series_logo=series_logo,
+        tvg_prefix=tvg_prefix,
+    )
+
+
+def build_multi_locale_entries(
+    *,
+    watch_targets: Sequence[str],
+    base_url: str,
+    arc_filters: Sequence[str] | None = None,
+    series_name: str | None = None,
+    series_group: str | None = None,
+    series_logo: str | None = None,
+    tvg_prefix: str | None = None,
+    max_workers: int | None = None,
+) -> tuple[dict[str, list[PlaylistEntry]], dict[str, Exception]]:
+    """Build one playlist per locale code or watch URL, keyed by the target as given.
+
+    Watch pages and Pixeldrain lists are fetched on thread pools, HTML parsing runs on a spawn-based process
+    pool, and a list shared by several locales is requested only once. A locale that fails is reported in the
+    second mapping instead of aborting the others.
+    """
+    if not watch_targets:
+        raise ValueError("At least one locale or watch URL is required")
+    urls = [resolve_watch_url(target) for target in watch_targets]
+    locales = {target: watch_page_locale(url) for target, url in zip(watch_targets, urls)}
+    errors: dict[str, Exception] = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as threads:
+        page_futures = {target: threads.submit(fetch_watch_page, url) for target, url in zip(watch_targets, urls)}
+    pages = _collect_results(page_futures, errors)
+
+    if len(pages) > 1:
+        # Spawn rather than fork so worker processes never inherit another pool's threads.
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as procs:
+            parse_futures = {
+                target: procs.submit(parse_watch_page, html, locales[target]) for target, html in pages.items()
+            }
+        parsed = _collect_results(parse_futures, errors)
+    else:
+        parsed = {}
+        for target, html in pages.items():
+            try:
+                parsed[target] = parse_watch_page(html, locales[target])
+            except Exception as exc:  # pylint: disable=broad-except
+                errors[target] = exc
+
+    selections = {target: select_arc_lists(arcs, arc_filters) for target, arcs in parsed.items()}
+    list_ids = list(dict.fromkeys(list_id for selected in selections.values() for _arc, list_id in selected))
+    log(f"Fetching {len(list_ids)} unique Pixeldrain list(s) for {len(selections)} locale(s)")
+    with ThreadPoolExecutor(max_workers=max_workers) as threads:
+        list_futures = {list_id: threads.submit(fetch_list_payload, list_id, base_url) for list_id in list_ids}
+    list_errors: dict[str, Exception] = {}
+    payloads = _collect_results(list_futures, list_errors)
+
+    results: dict[str, list[PlaylistEntry]] = {}
+    for target, selected in selections.items():
+        failed_list = next((list_id for _arc, list_id in selected if list_id in list_errors), None)
+        if failed_list is not None:
+            errors[target] = list_errors[failed_list]
+            continue
+        try:
+            results[target] = _assemble_onepace_entries(
+                selected,
+                payloads,
+                base_url=base_url,
+                series_name=series_name,
+                series_group=series_group,
+                series_logo=series_logo,
+                tvg_prefix=tvg_prefix,
+            )
+        except RuntimeError as exc:
+            errors[target] = exc
+    return results, errors
+
+
+def _collect_results(futures: Mapping[str, Future], errors: dict[str, Exception]) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    for key, future in futures.items():
+        try:
+            results[key] = future.result()
+        except Exception as exc:  # pylint: disable=broad-except
+            errors[key] = exc
+    return results
 
+
+def resolve_watch_url(target: str) -> str:
+    """Accept either a full watch URL or a One Pace site locale code such as ``fr``."""
+    candidate = (target or "").strip()
+    if not candidate:
+        raise ValueError("Locale or watch URL cannot be blank")
+    if urlparse(candidate).scheme:
+        return candidate
+    return ONEPACE_WATCH_URL_TEMPLATE.format(locale=candidate.strip("/"))
+
+
+def watch_page_locale(url: str) -> str | None:
+    """Site locale code of a One Pace watch URL (``fr`` for ``https://onepace.net/fr/watch``), if it has one."""
+    segments = [segment for segment in urlparse(url).path.split("/") if segment and segment != "watch"]
+    return segments[0].casefold() if segments else None
+
+
+def select_arc_lists(arcs: Sequence[OnePaceArc], arc_filters: Sequence[str] | None) -> list[tuple[OnePaceArc, str]]:
+    """Pair each arc that passes the filters with the Pixeldrain list ID of its best English subtitle link."""
+    selected: list[tuple[OnePaceArc, str]] = []
     for arc in arcs:
         if not arc_matches_filters(arc.title, arc_filters):
             continue
@@ -149,35 +282,86 @@ def build_onepace_entries(
         if not best_link:
             log(f"Skipping arc '{arc.title}' (no English subtitle links found)")
             continue
+        selected.append((arc, extract_list_id(best_link.href)))
+    return selected
+
 
-        list_id = extract_list_id(best_link.href)
-        payload = fetch_list_payload(list_id, base_url)
-        files = payload.get("files") or []
+def _assemble_onepace_entries(
+    selected: Sequence[tuple[OnePaceArc, str]],
+    payloads: Mapping[str, Mapping[str, Any]],
+    *,
+    base_url: str,
+    series_name: str | None,
+    series_group: str | None,
+    series_logo: str | None,
+    tvg_prefix: str | None,
+) -> list[PlaylistEntry]:
+    entries: list[PlaylistEntry] = []
+    series_prefix = (series_name or "").strip()
+    logo_value = DEFAULT_SERIES_LOGO if series_logo is None else series_logo
+
+    for arc, list_id in selected:
+        files = payloads[list_id].get("files") or []
         if not files:
             log(f"Skipping arc '{arc.title}' (Pixeldrain list '{list_id}' empty)")
             continue
 
         group_value = (series_group or arc.title).strip() or arc.title
-        for episode_index, file_info in enumerate(files, start=1):
-            file_name = file_info.get("name") or file_info.get("id")
-            if not file_name:
-                continue
-            url = compose_download_url(file_info["id"], base_url)
-            entry_title, attrs = format_arc_episode_metadata(
+        entries.extend(
+            build_arc_entries(
                 arc_title=arc.title,
                 group_title=group_value,
+                files=files,
+                base_url=base_url,
                 tvg_logo=logo_value,
                 tvg_prefix=tvg_prefix,
-                episode_index=episode_index,
                 series_prefix=series_prefix,
             )
-            entries.append(PlaylistEntry(title=entry_title, url=url, attrs=attrs))
+        )
 
     if not entries:
         raise RuntimeError("No playable entries were discovered from One Pace.")
     return entries
 
 
+def build_arc_entries(
+    *,
+    arc_title: str,
+    group_title: str,
+    files: Sequence[Mapping[str, Any]],
+    base_url: str,
+    tvg_logo: str | None,
+    tvg_prefix: str | None,
+    series_prefix: str = "",
+) -> list[PlaylistEntry]:
+    """Turn the files of one arc's Pixeldrain list into numbered episode entries."""
+    entries: list[PlaylistEntry] = []
+    for episode_index, file_info in enumerate(files, start=1):
+        file_name = file_info.get("name") or file_info.get("id")
+        if not file_name:
+            continue
+        url = compose_download_url(file_info["id"], base_url)
+        entry_title, attrs = format_arc_episode_metadata(
+            arc_title=arc_title,
+            group_title=group_title,
+            tvg_logo=tvg_logo,
+            tvg_prefix=tvg_prefix,
+            episode_index=episode_index,
+            series_prefix=series_prefix,
+        )
+        entries.append(
+            PlaylistEntry(
+                title=entry_title,
+                url=url,
+                duration=file_info.get("duration", -1),
+                attrs=attrs,
+                size=file_info.get("size", -1),
+                file_name=file_info.get("name"),
+            )
+        )
+    return entries
+
+
 def format_arc_episode_metadata(
     *,
     arc_title: str,
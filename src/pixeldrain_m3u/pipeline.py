@@ -0,0 +1,287 @@
+"""Pipelined One Pace build that streams each arc's block to disk as soon as it is ready.
+
+Stages (fetch page → parse arcs → fetch lists → build entries → render) run on their own threads and are
+connected by bounded queues, so at most ``queue_depth`` items wait between any two stages. The writer
+emits blocks strictly in arc order; blocks that finish early are held until every earlier arc is written.
+The parse stage only releases a new arc once fewer than ``queue_depth + fetch_workers`` arcs are in flight,
+which also caps that reorder buffer. Blocks are written to the destination itself, so players and tools see
+the playlist grow while it is built; a failed run leaves it truncated. With ``atomic=True`` output goes to a
+``<name>.partial`` sibling instead, which replaces the destination only once the whole playlist is written.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable, Sequence
+
+from .api import fetch_list_payload
+from .constants import DEFAULT_ONEPACE_WATCH_URL, DEFAULT_SERIES_LOGO
+from .log_utils import log
+from .onepace import (
+    OnePaceArc,
+    build_arc_entries,
+    fetch_watch_page,
+    parse_watch_page,
+    select_arc_lists,
+    watch_page_locale,
+)
+from .playlist import PlaylistEntry, render_m3u_entries, render_m3u_header
+
+DEFAULT_QUEUE_DEPTH = 4
+DEFAULT_FETCH_WORKERS = 4
+
+_DONE = object()
+
+
+@dataclass
+class QueueStats:
+    """Occupancy samples for one inter-stage queue, taken after every put."""
+
+    name: str
+    capacity: int
+    puts: int = 0
+    max_occupancy: int = 0
+    occupancy_total: int = 0
+
+    @property
+    def mean_occupancy(self) -> float:
+        return self.occupancy_total / self.puts if self.puts else 0.0
+
+
+@dataclass
+class PipelineResult:
+    """Outcome of a pipelined build: entry count, timings and per-queue statistics."""
+
+    destination: Path
+    entry_count: int
+    first_block_seconds: float | None
+    total_seconds: float
+    queue_stats: list[QueueStats] = field(default_factory=list)
+    reorder_capacity: int = 0
+    max_reordered: int = 0
+
+
+class _MonitoredQueue(queue.Queue):
+    def __init__(self, name: str, maxsize: int) -> None:
+        super().__init__(maxsize)
+        self.stats = QueueStats(name=name, capacity=maxsize)
+
+    def put(self, item: Any, block: bool = True, timeout: float | None = None) -> None:
+        super().put(item, block, timeout)
+        if item is _DONE:
+            return
+        with self.mutex:
+            occupancy = self._qsize()
+            self.stats.puts += 1
+            self.stats.occupancy_total += occupancy
+            self.stats.max_occupancy = max(self.stats.max_occupancy, occupancy)
+
+
+def run_onepace_pipeline(
+    *,
+    watch_url: str | None,
+    base_url: str,
+    destination: Path,
+    overwrite: bool,
+    title: str | None = None,
+    arc_filters: Sequence[str] | None = None,
+    series_name: str | None = None,
+    series_group: str | None = None,
+    series_logo: str | None = None,
+    tvg_prefix: str | None = None,
+    queue_depth: int = DEFAULT_QUEUE_DEPTH,
+    fetch_workers: int = DEFAULT_FETCH_WORKERS,
+    atomic: bool = False,
+) -> PipelineResult:
+    """Scrape One Pace and write an extended M3U playlist, arc by arc, as the blocks become ready."""
+    if queue_depth < 1 or fetch_workers < 1:
+        raise ValueError("queue_depth and fetch_workers must both be at least 1")
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    if destination.exists() and not overwrite:
+        raise FileExistsError(f"{destination} already exists. Use --overwrite to replace it.")
+
+    resolved_watch_url = (watch_url or DEFAULT_ONEPACE_WATCH_URL).strip() or DEFAULT_ONEPACE_WATCH_URL
+    series_prefix = (series_name or "").strip()
+    logo_value = DEFAULT_SERIES_LOGO if series_logo is None else series_logo
+    locale = watch_page_locale(resolved_watch_url)
+
+    def fetch_page(url: str) -> Iterable[str]:
+        yield fetch_watch_page(url)
+
+    def parse_arcs(html: str) -> Iterable[tuple[int, OnePaceArc, str]]:
+        for sequence, (arc, list_id) in enumerate(select_arc_lists(parse_watch_page(html, locale), arc_filters)):
+            while not in_flight.acquire(timeout=0.1):
+                if runner.error is not None:
+                    return
+            yield sequence, arc, list_id
+
+    def fetch_list(item: tuple[int, OnePaceArc, str]) -> Iterable[tuple[int, OnePaceArc, str, dict[str, Any]]]:
+        sequence, arc, list_id = item
+        yield sequence, arc, list_id, fetch_list_payload(list_id, base_url)
+
+    def build_entries(
+        item: tuple[int, OnePaceArc, str, dict[str, Any]],
+    ) -> Iterable[tuple[int, list[PlaylistEntry]]]:
+        sequence, arc, list_id, payload = item
+        files = payload.get("files") or []
+        if not files:
+            log(f"Skipping arc '{arc.title}' (Pixeldrain list '{list_id}' empty)")
+            yield sequence, []
+            return
+        yield sequence, build_arc_entries(
+            arc_title=arc.title,
+            group_title=(series_group or arc.title).strip() or arc.title,
+            files=files,
+            base_url=base_url,
+            tvg_logo=logo_value,
+            tvg_prefix=tvg_prefix,
+            series_prefix=series_prefix,
+        )
+
+    def render(item: tuple[int, list[PlaylistEntry]]) -> Iterable[tuple[int, str, int]]:
+        sequence, entries = item
+        yield sequence, render_m3u_entries(entries), len(entries)
+
+    runner = _PipelineRunner()
+    reorder_capacity = queue_depth + fetch_workers
+    in_flight = threading.Semaphore(reorder_capacity)
+    urls = _MonitoredQueue("watch-urls", 2)
+    pages = _MonitoredQueue("pages", queue_depth)
+    arcs = _MonitoredQueue("arcs", queue_depth)
+    payloads = _MonitoredQueue("payloads", queue_depth)
+    entries = _MonitoredQueue("entries", queue_depth)
+    blocks = _MonitoredQueue("blocks", queue_depth)
+    urls.put(resolved_watch_url)
+    urls.put(_DONE)
+
+    started = time.perf_counter()
+    first_block_seconds: float | None = None
+    entry_count = 0
+    max_reordered = 0
+    target = destination.with_name(f"{destination.name}.partial") if atomic else destination
+    with target.open("w", encoding="utf-8") as handle:
+        handle.write(render_m3u_header(title))
+        handle.flush()
+        runner.start("fetch-page", urls, pages, fetch_page)
+        runner.start("parse-arcs", pages, arcs, parse_arcs, sentinels_out=fetch_workers)
+        for worker in range(fetch_workers):
+            runner.start(f"fetch-list-{worker}", arcs, payloads, fetch_list)
+        runner.start("build-entries", payloads, entries, build_entries, sentinels_in=fetch_workers)
+        runner.start("render", entries, blocks, render)
+
+        pending: dict[int, tuple[str, int]] = {}
+        next_sequence = 0
+        while True:
+            item = blocks.get()
+            if item is _DONE:
+                break
+            if runner.error is not None:
+                continue
+            sequence, text, count = item
+            pending[sequence] = (text, count)
+            max_reordered = max(max_reordered, len(pending))
+            try:
+                while next_sequence in pending:
+                    text, count = pending.pop(next_sequence)
+                    if text:
+                        handle.write(text)
+                        handle.flush()
+                        if first_block_seconds is None:
+                            first_block_seconds = time.perf_counter() - started
+                    entry_count += count
+                    next_sequence += 1
+                    in_flight.release()
+            except Exception as exc:  # pylint: disable=broad-except
+                runner.fail(exc)
+    runner.join()
+
+    error = runner.error
+    if error is None and not entry_count:
+        error = RuntimeError("No playable entries were discovered from One Pace.")
+    if error is not None:
+        if atomic:
+            target.unlink(missing_ok=True)
+        raise error
+    if atomic:
+        os.replace(target, destination)
+
+    log(f"Playlist written to {destination.resolve()}")
+    return PipelineResult(
+        destination=destination,
+        entry_count=entry_count,
+        first_block_seconds=first_block_seconds,
+        total_seconds=time.perf_counter() - started,
+        queue_stats=[queue_.stats for queue_ in (pages, arcs, payloads, entries, blocks)],
+        reorder_capacity=reorder_capacity,
+        max_reordered=max_reordered,
+    )
+
+
+class _PipelineRunner:
+    """Owns the stage threads and the first error raised by any of them.
+
+    After an error every stage keeps draining its input (without doing work) until the end-of-stream
+    marker arrives, so no producer is left blocked on a full queue.
+    """
+
+    def __init__(self) -> None:
+        self.error: BaseException | None = None
+        self._lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+
+    def fail(self, exc: BaseException) -> None:
+        with self._lock:
+            if self.error is None:
+                self.error = exc
+
+    def start(
+        self,
+        name: str,
+        source: queue.Queue,
+        sink: queue.Queue,
+        handler: Callable[[Any], Iterable[Any]],
+        *,
+        sentinels_in: int = 1,
+        sentinels_out: int = 1,
+    ) -> None:
+        thread = threading.Thread(
+            target=self._run_stage,
+            args=(source, sink, handler, sentinels_in, sentinels_out),
+            name=f"pipeline-{name}",
+            daemon=True,
+        )
+        self._threads.append(thread)
+        thread.start()
+
+    def join(self) -> None:
+        for thread in self._threads:
+            thread.join()
+
+    def _run_stage(
+        self,
+        source: queue.Queue,
+        sink: queue.Queue,
+        handler: Callable[[Any], Iterable[Any]],
+        sentinels_in: int,
+        sentinels_out: int,
+    ) -> None:
+        seen = 0
+        while seen < sentinels_in:
+            item = source.get()
+            if item is _DONE:
+                seen += 1
+                continue
+            if self.error is not None:
+                continue
+            try:
+                for produced in handler(item):
+                    sink.put(produced)
+            except Exception as exc:  # pylint: disable=broad-except
+                self.fail(exc)
+        for _ in range(sentinels_out):
+            sink.put(_DONE)
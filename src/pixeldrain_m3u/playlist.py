@@ -3,12 +3,16 @@
 from __future__ import annotations
 
 import math
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Mapping, Sequence
+from typing import Any, Mapping, Sequence
 
+from .api import compose_download_url
 from .log_utils import log
 
+DEFAULT_SEGMENT_SECONDS = 10
+TS_PACKET_SIZE = 188
+
 PREFERRED_ATTR_ORDER = (
     "tvg-id",
     "tvg-name",
@@ -23,8 +27,24 @@ class PlaylistEntry:
 
     title: str
     url: str
-    duration: int = -1
+    duration: float = -1
     attrs: Mapping[str, str] | None = None
+    size: int = -1
+    file_name: str | None = None
+
+
+def build_list_entries(files: Sequence[Mapping[str, Any]], base_url: str) -> list[PlaylistEntry]:
+    """Map the files of a plain Pixeldrain list onto playlist entries."""
+    return [
+        PlaylistEntry(
+            title=file_info.get("name") or file_info["id"],
+            url=compose_download_url(file_info["id"], base_url),
+            duration=file_info.get("duration", -1),
+            size=file_info.get("size", -1),
+            file_name=file_info.get("name"),
+        )
+        for file_info in files
+    ]
 
 
 def render_m3_playlist(entries: Sequence[PlaylistEntry], title: str | None = None) -> str:
@@ -32,10 +52,20 @@ def render_m3_playlist(entries: Sequence[PlaylistEntry], title: str | None = Non
     if not entries:
         raise ValueError("Cannot render a playlist with zero entries")
 
+    return render_m3u_header(title) + render_m3u_entries(entries)
+
+
+def render_m3u_header(title: str | None = None) -> str:
+    """Render the extended M3U header lines that precede the entries."""
     lines: list[str] = ["#EXTM3U"]
     if title:
         lines.append(f"# Playlist: {title}")
+    return "\n".join(lines) + "\n"
+
 
+def render_m3u_entries(entries: Sequence[PlaylistEntry]) -> str:
+    """Render the ``#EXTINF``/URL line pairs for a block of entries (empty string for no entries)."""
+    lines: list[str] = []
     for entry in entries:
         attr_text = ""
         if entry.attrs:
@@ -49,7 +79,7 @@ def render_m3_playlist(entries: Sequence[PlaylistEntry], title: str | None = Non
         lines.append(f"#EXTINF:{duration}{attr_text},{entry.title}")
         lines.append(entry.url)
 
-    return "\n".join(lines) + "\n"
+    return "\n".join(lines) + "\n" if lines else ""
 
 
 def render_m3u8_playlist(entries: Sequence[PlaylistEntry], title: str | None = None) -> str:
@@ -77,6 +107,112 @@ def render_m3u8_playlist(entries: Sequence[PlaylistEntry], title: str | None = N
     return "\n".join(lines) + "\n"
 
 
+def compute_byte_range_segments(size: int, duration: float, target_seconds: float) -> list[tuple[float, int, int]]:
+    """Split an MPEG-TS file into ``(duration, length, offset)`` segments of at most ``target_seconds``.
+
+    Pixeldrain exposes no keyframe index, so bytes are assumed to be spread evenly over time. Every cut lands
+    on a 188-byte transport packet boundary so no packet is split, but segments rarely start on a keyframe:
+    a player starting mid-file decodes from the next keyframe, and segment durations are only estimates.
+    """
+    if size <= 0:
+        raise ValueError("size must be positive to compute byte ranges")
+    if duration <= 0 or target_seconds <= 0:
+        return [(float(_coerce_duration(duration)), size, 0)]
+    packets = size // TS_PACKET_SIZE
+    count = max(1, min(packets, math.ceil(duration / target_seconds)))
+    segment_duration = duration / count
+    boundaries = [TS_PACKET_SIZE * (packets * index // count) for index in range(count)] + [size]
+    return [(segment_duration, end - start, start) for start, end in zip(boundaries, boundaries[1:])]
+
+
+def supports_byte_range_segments(entry: PlaylistEntry) -> bool:
+    """Whether ``entry`` can be cut into HLS byte ranges: an MPEG-TS file with known size and duration.
+
+    HLS only defines MPEG-TS and fragmented MP4 (with ``EXT-X-MAP``) segments; Matroska and plain MP4
+    cannot be split at arbitrary offsets, so those files are served as one whole-file segment.
+    """
+    file_name = (entry.file_name or "").lower()
+    return file_name.endswith(".ts") and entry.size >= TS_PACKET_SIZE and entry.duration > 0
+
+
+def render_hls_media_playlist(entry: PlaylistEntry, target_seconds: float = DEFAULT_SEGMENT_SECONDS) -> str:
+    """Render one episode as a VOD media playlist, using ``EXT-X-BYTERANGE`` segments for MPEG-TS files."""
+    if supports_byte_range_segments(entry):
+        segments = compute_byte_range_segments(entry.size, entry.duration, target_seconds)
+    else:
+        segments = [(float(_coerce_duration(entry.duration)), -1, 0)]
+    target_duration = max(1, max(math.ceil(duration) for duration, _, _ in segments))
+
+    lines: list[str] = [
+        "#EXTM3U",
+        "#EXT-X-VERSION:4",
+        "#EXT-X-MEDIA-SEQUENCE:0",
+        "#EXT-X-PLAYLIST-TYPE:VOD",
+        f"#EXT-X-TARGETDURATION:{target_duration}",
+    ]
+    for duration, length, offset in segments:
+        lines.append(f"#EXTINF:{duration:.3f},{entry.title}")
+        if length > 0:
+            lines.append(f"#EXT-X-BYTERANGE:{length}@{offset}")
+        lines.append(entry.url)
+    lines.append("#EXT-X-ENDLIST")
+    return "\n".join(lines) + "\n"
+
+
+def render_hls_master_playlist(
+    entries: Sequence[PlaylistEntry], media_uris: Sequence[str | None], title: str | None = None
+) -> str:
+    """Render the extended M3U index; entries without a media playlist URI link straight to their file."""
+    if len(entries) != len(media_uris):
+        raise ValueError("Each entry needs exactly one media playlist URI (or None)")
+    return render_m3_playlist(
+        [entry if uri is None else replace(entry, url=uri) for entry, uri in zip(entries, media_uris)], title
+    )
+
+
+def write_hls_playlists(
+    entries: Sequence[PlaylistEntry],
+    destination: Path,
+    overwrite: bool,
+    title: str | None = None,
+    target_seconds: float = DEFAULT_SEGMENT_SECONDS,
+) -> Path:
+    """Write byte-range media playlists next to ``destination`` plus the index at ``destination``.
+
+    Only MPEG-TS entries get a media playlist under ``<stem>-media/``; every other entry is linked directly
+    from the index. Media playlists left over from an earlier run are removed.
+    """
+    if not entries:
+        raise ValueError("Cannot render a playlist with zero entries")
+    if target_seconds <= 0:
+        raise ValueError("target_seconds must be positive")
+    if destination.exists() and not overwrite:
+        raise FileExistsError(f"{destination} already exists. Use --overwrite to replace it.")
+
+    media_dir = destination.parent / f"{destination.stem}-media"
+    width = max(4, len(str(len(entries))))
+    media_uris: list[str | None] = []
+    written: set[str] = set()
+    for index, entry in enumerate(entries, start=1):
+        if not supports_byte_range_segments(entry):
+            media_uris.append(None)
+            continue
+        media_name = f"{index:0{width}d}.m3u8"
+        media_dir.mkdir(parents=True, exist_ok=True)
+        (media_dir / media_name).write_text(render_hls_media_playlist(entry, target_seconds), encoding="utf-8")
+        media_uris.append(f"{media_dir.name}/{media_name}")
+        written.add(media_name)
+    if media_dir.is_dir():
+        for stale in media_dir.glob("*.m3u8"):
+            if stale.name not in written:
+                stale.unlink()
+        if not written and not any(media_dir.iterdir()):
+            media_dir.rmdir()
+    if written:
+        log(f"Wrote {len(written)} media playlists to {media_dir.resolve()}")
+    return write_playlist(render_hls_master_playlist(entries, media_uris, title), destination, overwrite=True)
+
+
 def write_playlist(content: str, destination: Path, overwrite: bool) -> Path:
     """Write the playlist to disk and return the path."""
     destination.parent.mkdir(parents=True, exist_ok=True)
@@ -122,7 +258,7 @@ def _render_m3u8_entry(entry: PlaylistEntry, duration: int, index: int) -> list[
     return lines
 
 
-def _coerce_duration(value: int) -> int:
+def _coerce_duration(value: float) -> int:
     if value and value > 0:
         return int(math.ceil(value))
     return 1
@@ -0,0 +1,113 @@
+import pytest
+
+from pixeldrain_m3u.distributed import (
+    BuildOptions,
+    ShardClaim,
+    ShardSpec,
+    claim_shard,
+    complete_shard,
+    enqueue_build,
+    merge_results,
+    run_coordinator,
+    run_worker,
+)
+
+PAYLOADS = {
+    "AAA": {"title": "First", "files": [{"id": "a1", "name": "a1.mkv"}, {"id": "a2", "name": "a2.mkv"}]},
+    "BBB": {"title": "Second", "files": [{"id": "b1", "name": "b1.mkv"}]},
+}
+
+
+def _fake_fetch(list_id, _base):
+    return PAYLOADS[list_id]
+
+
+def test_run_coordinator_merges_shards_in_queue_order(monkeypatch, tmp_path):
+    monkeypatch.setattr("pixeldrain_m3u.distributed.fetch_list_payload", _fake_fetch)
+    shards = [
+        ShardSpec(list_id="BBB", arc_title="Orange Town", group_title="Orange Town"),
+        ShardSpec(list_id="AAA"),
+    ]
+
+    title, entries = run_coordinator(
+        tmp_path / "queue",
+        shards,
+        BuildOptions(base_url="https://pixeldrain.net", tvg_logo=""),
+        poll_interval=0,
+    )
+
+    assert title == "Second"
+    assert [entry.title for entry in entries] == ["Orange Town E01", "a1.mkv", "a2.mkv"]
+    assert entries[0].attrs["group-title"] == "Orange Town"
+    assert entries[2].url.endswith("/api/file/a2")
+
+
+def test_claim_shard_reclaims_expired_lease(tmp_path):
+    queue_path = tmp_path / "queue"
+    build_id = enqueue_build(queue_path, [ShardSpec(list_id="AAA")], BuildOptions(base_url="https://pixeldrain.net"))
+
+    assert claim_shard(queue_path, build_id, "dead-worker", lease_seconds=10, now=100.0) is not None
+    assert claim_shard(queue_path, build_id, "live-worker", lease_seconds=10, now=105.0) is None
+
+    reclaimed = claim_shard(queue_path, build_id, "live-worker", lease_seconds=10, now=111.0)
+
+    assert reclaimed is not None
+    assert reclaimed.shard.list_id == "AAA"
+    assert reclaimed.attempt == 2
+    assert not complete_shard(
+        queue_path,
+        ShardClaim(build_id=build_id, shard_index=0, attempt=1, shard=reclaimed.shard),
+        "dead-worker",
+        {"title": None, "entries": []},
+    )
+
+
+def test_merge_results_rejects_unfinished_build(tmp_path):
+    queue_path = tmp_path / "queue"
+    enqueue_build(queue_path, [ShardSpec(list_id="AAA")], BuildOptions(base_url="https://pixeldrain.net"))
+
+    with pytest.raises(RuntimeError, match="outstanding"):
+        merge_results(queue_path)
+
+
+def test_claim_shard_fails_shard_whose_lease_keeps_expiring(tmp_path):
+    queue_path = tmp_path / "queue"
+    options = BuildOptions(base_url="https://pixeldrain.net", max_attempts=2)
+    build_id = enqueue_build(queue_path, [ShardSpec(list_id="AAA")], options)
+
+    assert claim_shard(queue_path, build_id, "w1", lease_seconds=10, now=100.0) is not None
+    assert claim_shard(queue_path, build_id, "w2", lease_seconds=10, now=111.0) is not None
+
+    assert claim_shard(queue_path, build_id, "w3", lease_seconds=10, now=122.0) is None
+
+    with pytest.raises(RuntimeError, match="1 shard\\(s\\) failed"):
+        merge_results(queue_path, build_id)
+
+
+def test_stale_worker_cannot_complete_shard_of_newer_build(monkeypatch, tmp_path):
+    monkeypatch.setattr("pixeldrain_m3u.distributed.fetch_list_payload", _fake_fetch)
+    queue_path = tmp_path / "queue"
+    options = BuildOptions(base_url="https://pixeldrain.net")
+    old_build = enqueue_build(queue_path, [ShardSpec(list_id="AAA")], options)
+    stale_claim = claim_shard(queue_path, old_build, "slow-worker")
+    enqueue_build(queue_path, [ShardSpec(list_id="BBB")], options)
+
+    assert not complete_shard(queue_path, stale_claim, "slow-worker", {"title": "First", "entries": []})
+
+    run_worker(queue_path, poll_interval=0)
+    title, entries = merge_results(queue_path)
+
+    assert title == "Second"
+    assert [entry.title for entry in entries] == ["b1.mkv"]
+
+
+def test_superseded_build_is_not_served_or_merged(tmp_path):
+    queue_path = tmp_path / "queue"
+    options = BuildOptions(base_url="https://pixeldrain.net")
+    old_build = enqueue_build(queue_path, [ShardSpec(list_id="AAA")], options)
+    enqueue_build(queue_path, [ShardSpec(list_id="BBB")], options)
+
+    with pytest.raises(RuntimeError, match="was replaced"):
+        run_worker(queue_path, build_id=old_build, poll_interval=0)
+    with pytest.raises(RuntimeError, match="was replaced"):
+        merge_results(queue_path, old_build)
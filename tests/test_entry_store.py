@@ -0,0 +1,76 @@
+import os
+import stat
+
+import pytest
+
+from pixeldrain_m3u.entry_store import EntryStore, write_entry_store
+from pixeldrain_m3u.playlist import PlaylistEntry, render_m3_playlist
+
+
+def _sample_entries():
+    return [
+        PlaylistEntry(
+            title=f"{arc} E{episode:02d}",
+            url=f"https://pixeldrain.net/api/file/{arc[:1]}{episode}",
+            duration=60 * episode + (0.5 if arc == "Orange Town" else 0),
+            attrs={"tvg-id": "", "tvg-name": f"{arc} E{episode:02d}", "group-title": arc},
+            size=1000 * episode,
+            file_name=f"{episode}.mkv",
+        )
+        for arc in ("Romance Dawn", "Orange Town")
+        for episode in (1, 2, 3)
+    ] + [PlaylistEntry(title="Extra • Bonus", url="https://example.com/bonus")]
+
+
+def test_entry_store_round_trips_entries(tmp_path):
+    entries = _sample_entries()
+    path = write_entry_store(entries, tmp_path / "library.pdes", overwrite=False)
+
+    with EntryStore(path) as store:
+        assert len(store) == len(entries)
+        assert list(store) == entries
+        assert store[-1] == entries[-1]
+        assert store[1:3] == entries[1:3]
+        with pytest.raises(IndexError):
+            store[len(entries)]
+        assert store[4].duration == 120.5
+        assert store[4].file_name == "2.mkv"
+    assert [path.name for path in tmp_path.iterdir()] == ["library.pdes"]
+
+
+def test_entry_store_slices_groups_and_renders_ranges(tmp_path):
+    entries = _sample_entries()
+    path = write_entry_store(entries, tmp_path / "library.pdes", overwrite=False)
+
+    with EntryStore(path) as store:
+        assert store.groups() == ["Romance Dawn", "Orange Town"]
+        assert store.group_indices("Orange Town") == [3, 4, 5]
+        assert store.render_m3u(group="Orange Town", start=1, title="Arc") == render_m3_playlist(entries[4:6], "Arc")
+        assert store.render_m3u(2, 5) == render_m3_playlist(entries[2:5])
+
+
+def test_write_entry_store_refuses_to_overwrite(tmp_path):
+    path = write_entry_store(_sample_entries(), tmp_path / "library.pdes", overwrite=False)
+
+    with pytest.raises(FileExistsError):
+        write_entry_store(_sample_entries(), path, overwrite=False)
+
+
+@pytest.mark.skipif(os.name != "posix", reason="file modes are POSIX-only")
+def test_write_entry_store_uses_umask_mode(tmp_path):
+    previous = os.umask(0o022)
+    try:
+        path = write_entry_store(_sample_entries(), tmp_path / "library.pdes", overwrite=False)
+    finally:
+        os.umask(previous)
+
+    assert stat.S_IMODE(path.stat().st_mode) == 0o644
+
+
+@pytest.mark.parametrize("content", [b"", b"PDM3US02\x00"])
+def test_entry_store_rejects_truncated_file(tmp_path, content):
+    path = tmp_path / "broken.pdes"
+    path.write_bytes(content)
+
+    with pytest.raises(ValueError, match="too short"):
+        EntryStore(path)
@@ -1,8 +1,10 @@
 from pixeldrain_m3u.onepace import (
     OnePaceLink,
+    build_multi_locale_entries,
     build_onepace_entries,
     format_arc_episode_metadata,
     parse_watch_page,
+    resolve_watch_url,
     sanitize_arc_filename,
     select_best_quality,
 )
@@ -125,3 +127,71 @@ def test_build_onepace_entries_sets_group_title_per_arc(monkeypatch):
     assert entries[0].attrs["group-title"] == "Romance Dawn"
     assert "f1" in entries[0].url
 
+
+def test_resolve_watch_url_accepts_locale_codes_and_urls():
+    assert resolve_watch_url("fr") == "https://onepace.net/fr/watch"
+    assert resolve_watch_url("https://example.invalid/de/watch") == "https://example.invalid/de/watch"
+
+
+def test_build_multi_locale_entries_fetches_shared_lists_once(monkeypatch):
+    requested_pages = []
+    requested_lists = []
+
+    def fake_fetch_page(url):
+        requested_pages.append(url)
+        if "/fr/" in url:
+            return SAMPLE_HTML.replace("English Subtitles", "Sous-titres anglais")
+        return SAMPLE_HTML
+
+    def fake_fetch_list(list_id, _base):
+        requested_lists.append(list_id)
+        return {"files": [{"id": "f1", "name": "a.mkv"}]}
+
+    monkeypatch.setattr("pixeldrain_m3u.onepace.fetch_watch_page", fake_fetch_page)
+    monkeypatch.setattr("pixeldrain_m3u.onepace.fetch_list_payload", fake_fetch_list)
+
+    results, errors = build_multi_locale_entries(
+        watch_targets=["en", "fr"],
+        base_url="https://pixeldrain.net",
+    )
+
+    assert errors == {}
+    assert sorted(requested_pages) == ["https://onepace.net/en/watch", "https://onepace.net/fr/watch"]
+    assert requested_lists == ["BBB"]
+    assert list(results) == ["en", "fr"]
+    assert results["fr"][0].title == "Romance Dawn E01"
+
+
+def test_parse_watch_page_recognises_localized_subtitle_label():
+    french_html = SAMPLE_HTML.replace("English Subtitles", "Sous-titres anglais")
+
+    arcs = parse_watch_page(french_html, "fr")
+
+    assert [link.href for link in arcs[0].english_subtitles] == [
+        "https://pixeldrain.net/l/AAA",
+        "https://pixeldrain.net/l/BBB",
+    ]
+    assert parse_watch_page(french_html, "en")[0].english_subtitles == []
+
+
+def test_build_multi_locale_entries_isolates_failing_locale(monkeypatch):
+    pages = {
+        "https://onepace.net/en/watch": SAMPLE_HTML,
+        "https://onepace.net/fr/watch": SAMPLE_HTML.replace("English Subtitles", "Sous-titres anglais"),
+        "https://onepace.net/xx/watch": SAMPLE_HTML.replace("English Subtitles", "Unknown label"),
+    }
+    monkeypatch.setattr("pixeldrain_m3u.onepace.fetch_watch_page", pages.__getitem__)
+    monkeypatch.setattr(
+        "pixeldrain_m3u.onepace.fetch_list_payload",
+        lambda _list_id, _base: {"files": [{"id": "f1", "name": "a.mkv"}]},
+    )
+
+    results, errors = build_multi_locale_entries(
+        watch_targets=["en", "fr", "xx", "https://example.invalid/de/watch"],
+        base_url="https://pixeldrain.net",
+    )
+
+    assert sorted(results) == ["en", "fr"]
+    assert results["fr"][0].title == "Romance Dawn E01"
+    assert sorted(errors) == ["https://example.invalid/de/watch", "xx"]
+    assert "No playable entries" in str(errors["xx"])
@@ -0,0 +1,139 @@
+import time
+
+import pytest
+
+from pixeldrain_m3u.onepace import build_onepace_entries
+from pixeldrain_m3u.pipeline import run_onepace_pipeline
+from pixeldrain_m3u.playlist import render_m3_playlist
+
+ARC_TEMPLATE = """
+        <li>
+          <div>
+            <h2>{title}</h2>
+            <ul class="space-y-6">
+              <li>
+                <span><span>English Subtitles</span></span>
+                <ul class="flex">
+                  <li><a href="https://pixeldrain.net/l/{list_id}">Pixeldrain:1080p</a></li>
+                </ul>
+              </li>
+            </ul>
+          </div>
+        </li>
+"""
+
+ARCS = [("Romance Dawn", "AAA"), ("Orange Town", "BBB"), ("Syrup Village", "CCC")]
+WATCH_HTML = "<html><body><main><ol>{}</ol></main></body></html>".format(
+    "".join(ARC_TEMPLATE.format(title=title, list_id=list_id) for title, list_id in ARCS)
+)
+
+
+def _fake_fetch_list(list_id, _base):
+    if list_id == "AAA":
+        time.sleep(0.05)
+    return {"files": [{"id": f"{list_id}-{index}", "name": f"{index}.mkv"} for index in range(2)]}
+
+
+@pytest.fixture
+def fake_network(monkeypatch):
+    monkeypatch.setattr("pixeldrain_m3u.onepace.fetch_watch_page", lambda _url: WATCH_HTML)
+    monkeypatch.setattr("pixeldrain_m3u.pipeline.fetch_watch_page", lambda _url: WATCH_HTML)
+    monkeypatch.setattr("pixeldrain_m3u.onepace.fetch_list_payload", _fake_fetch_list)
+    monkeypatch.setattr("pixeldrain_m3u.pipeline.fetch_list_payload", _fake_fetch_list)
+
+
+def test_pipeline_output_matches_batch_render_in_arc_order(fake_network, tmp_path):
+    result = run_onepace_pipeline(
+        watch_url=None,
+        base_url="https://pixeldrain.net",
+        destination=tmp_path / "onepace.m3u",
+        overwrite=False,
+        title="One Pace",
+        queue_depth=1,
+        fetch_workers=3,
+    )
+
+    expected = render_m3_playlist(
+        build_onepace_entries(watch_url=None, base_url="https://pixeldrain.net"),
+        "One Pace",
+    )
+    assert result.destination.read_text(encoding="utf-8") == expected
+    assert result.entry_count == 6
+    assert result.first_block_seconds is not None
+    assert {stats.name for stats in result.queue_stats} == {"pages", "arcs", "payloads", "entries", "blocks"}
+    assert all(stats.max_occupancy <= stats.capacity for stats in result.queue_stats)
+
+
+def test_pipeline_bounds_reorder_buffer_when_first_arc_is_slow(monkeypatch, tmp_path):
+    arcs = [(f"Arc {index:02d}", f"L{index:02d}") for index in range(60)]
+    html = "<html><body><main><ol>{}</ol></main></body></html>".format(
+        "".join(ARC_TEMPLATE.format(title=title, list_id=list_id) for title, list_id in arcs)
+    )
+
+    def slow_first_fetch(list_id, _base):
+        if list_id == "L00":
+            time.sleep(0.3)
+        return {"files": [{"id": f"{list_id}-0", "name": "0.mkv"}]}
+
+    monkeypatch.setattr("pixeldrain_m3u.pipeline.fetch_watch_page", lambda _url: html)
+    monkeypatch.setattr("pixeldrain_m3u.pipeline.fetch_list_payload", slow_first_fetch)
+
+    result = run_onepace_pipeline(
+        watch_url=None,
+        base_url="https://pixeldrain.net",
+        destination=tmp_path / "onepace.m3u",
+        overwrite=False,
+        queue_depth=1,
+        fetch_workers=2,
+    )
+
+    assert result.entry_count == 60
+    assert result.reorder_capacity == 3
+    assert 1 <= result.max_reordered <= 3
+
+
+def test_pipeline_output_is_visible_while_building(monkeypatch, fake_network, tmp_path):
+    destination = tmp_path / "onepace.m3u"
+    snapshots = []
+
+    def fetch_last_arc_late(list_id, base):
+        if list_id == "CCC":
+            deadline = time.monotonic() + 5
+            while "Orange Town" not in (destination.read_text(encoding="utf-8") if destination.exists() else ""):
+                assert time.monotonic() < deadline, "earlier arcs were not written before the last arc finished"
+                time.sleep(0.01)
+            snapshots.append(destination.read_text(encoding="utf-8"))
+        return _fake_fetch_list(list_id, base)
+
+    monkeypatch.setattr("pixeldrain_m3u.pipeline.fetch_list_payload", fetch_last_arc_late)
+
+    result = run_onepace_pipeline(
+        watch_url=None,
+        base_url="https://pixeldrain.net",
+        destination=destination,
+        overwrite=False,
+        fetch_workers=3,
+    )
+
+    assert "Syrup Village" not in snapshots[0]
+    assert "Syrup Village" in result.destination.read_text(encoding="utf-8")
+
+
+def test_atomic_pipeline_keeps_existing_playlist_on_error(monkeypatch, fake_network, tmp_path):
+    def broken_fetch(list_id, _base):
+        raise RuntimeError(f"boom {list_id}")
+
+    monkeypatch.setattr("pixeldrain_m3u.pipeline.fetch_list_payload", broken_fetch)
+    destination = tmp_path / "onepace.m3u"
+    destination.write_text("previous playlist\n", encoding="utf-8")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        run_onepace_pipeline(
+            watch_url=None,
+            base_url="https://pixeldrain.net",
+            destination=destination,
+            overwrite=True,
+            atomic=True,
+        )
+    assert destination.read_text(encoding="utf-8") == "previous playlist\n"
+    assert [path.name for path in tmp_path.iterdir()] == ["onepace.m3u"]
@@ -1,4 +1,11 @@
-from pixeldrain_m3u.playlist import PlaylistEntry, render_m3_playlist, render_m3u8_playlist
+from pixeldrain_m3u.playlist import (
+    PlaylistEntry,
+    compute_byte_range_segments,
+    render_hls_media_playlist,
+    render_m3_playlist,
+    render_m3u8_playlist,
+    write_hls_playlists,
+)
 
 
 def test_render_playlist_formats_attributes_and_titles():
@@ -31,3 +38,79 @@ def test_render_m3u8_playlist_emits_required_tags():
     assert "#EXT-X-DATERANGE:" in content
     assert content.strip().endswith("#EXT-X-ENDLIST")
 
+
+def test_compute_byte_range_segments_covers_whole_file():
+    size = 188 * 100 + 7
+    segments = compute_byte_range_segments(size=size, duration=25, target_seconds=10)
+
+    assert len(segments) == 3
+    assert all(duration <= 10 for duration, _, _ in segments)
+    assert segments[0][2] == 0
+    assert all(offset % 188 == 0 for _, _, offset in segments)
+    assert sum(length for _, length, _ in segments) == size
+    assert segments[-1][1] + segments[-1][2] == size
+
+
+def test_render_hls_media_playlist_emits_byte_ranges_for_mpeg_ts():
+    entry = PlaylistEntry(
+        title="Episode 1", url="https://example.com/1", duration=20, size=376 * 10, file_name="ep1.ts"
+    )
+
+    content = render_hls_media_playlist(entry, target_seconds=10)
+
+    assert "#EXT-X-VERSION:4" in content
+    assert "#EXT-X-TARGETDURATION:10" in content
+    assert "#EXT-X-BYTERANGE:1880@0" in content
+    assert "#EXT-X-BYTERANGE:1880@1880" in content
+    assert content.strip().endswith("#EXT-X-ENDLIST")
+
+
+def test_render_hls_media_playlist_keeps_matroska_whole():
+    entry = PlaylistEntry(
+        title="Episode 1", url="https://example.com/1", duration=20, size=376 * 10, file_name="ep1.mkv"
+    )
+
+    content = render_hls_media_playlist(entry, target_seconds=10)
+
+    assert "#EXT-X-BYTERANGE" not in content
+    assert content.count("https://example.com/1") == 1
+
+
+def test_write_hls_playlists_links_master_to_media_playlists(tmp_path):
+    entries = [
+        PlaylistEntry(
+            title="Episode 1",
+            url="https://example.com/1",
+            duration=30,
+            size=188 * 30,
+            attrs={"group-title": "Arc"},
+            file_name="ep1.ts",
+        ),
+        PlaylistEntry(title="Episode 2", url="https://example.com/2"),
+    ]
+
+    master = write_hls_playlists(entries, tmp_path / "arc.m3u8", overwrite=False, title="Arc")
+
+    content = master.read_text(encoding="utf-8")
+    assert "arc-media/0001.m3u8" in content
+    assert 'group-title="Arc",Episode 1' in content
+    assert "https://example.com/2" in content
+    assert sorted(path.name for path in (tmp_path / "arc-media").iterdir()) == ["0001.m3u8"]
+
+
+def test_write_hls_playlists_links_matroska_directly_and_clears_stale_media(tmp_path):
+    media_dir = tmp_path / "arc-media"
+    media_dir.mkdir()
+    (media_dir / "0001.m3u8").write_text("stale", encoding="utf-8")
+    entries = [
+        PlaylistEntry(
+            title="Episode 1", url="https://example.com/1", duration=20, size=376 * 10, file_name="ep1.mkv"
+        ),
+    ]
+
+    master = write_hls_playlists(entries, tmp_path / "arc.m3u8", overwrite=True)
+
+    content = master.read_text(encoding="utf-8")
+    assert "https://example.com/1" in content
+    assert "arc-media" not in content
+    assert not media_dir.exists()